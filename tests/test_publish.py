@@ -0,0 +1,152 @@
+"""Tests for `prompt-tracker publish` against a stub memento CLI on PATH"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "prompt-tracker"
+
+# Logs every call; note IDs listed in MEMENTO_STUB_TRANSIENT fail with a
+# retryable error, those in MEMENTO_STUB_USAGE fail with exit code 2
+STUB_MEMENTO = """#!/bin/sh
+echo "$1 $2" >> "$MEMENTO_STUB_LOG"
+for id in $MEMENTO_STUB_TRANSIENT; do
+    [ "$id" = "$2" ] && { echo "connection reset" >&2; exit 1; }
+done
+for id in $MEMENTO_STUB_USAGE; do
+    [ "$id" = "$2" ] && { echo "bad arguments" >&2; exit 2; }
+done
+exit 0
+"""
+
+# Three prompts logged within the same second
+BASE_TIMESTAMP = 1700000000000
+
+
+class PublishTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+        bin_dir = self.dir / "bin"
+        bin_dir.mkdir()
+        stub = bin_dir / "memento"
+        stub.write_text(STUB_MEMENTO)
+        stub.chmod(0o755)
+
+        self.log = self.dir / "calls.log"
+        self.db = self.dir / "prompts.db"
+        self.env = {
+            **os.environ,
+            'PATH': f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            'HOME': str(self.dir),
+            'MEMENTO_STUB_LOG': str(self.log),
+            'MEMENTO_STUB_TRANSIENT': '',
+            'MEMENTO_STUB_USAGE': '',
+        }
+
+        history = self.dir / "history.jsonl"
+        with open(history, 'w') as f:
+            for i in range(3):
+                f.write(json.dumps({
+                    'timestamp': BASE_TIMESTAMP + i * 300,
+                    'display': f"prompt {i}",
+                    'project': '/tmp/project',
+                }) + "\n")
+
+        self.run_cli('sync', '--history', str(history))
+        for prompt_id in (1, 2, 3):
+            self.run_cli('rate', str(prompt_id), '5')
+
+        # All three prompts share a second, so IDs must differ by prompt ID
+        self.note_ids = {i: self.dry_run_note_id(i) for i in (1, 2, 3)}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *args, check=True):
+        result = subprocess.run(
+            [sys.executable, str(SCRIPT), '--db', str(self.db), *args],
+            env=self.env, capture_output=True, text=True
+        )
+        if check:
+            self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        return result
+
+    def calls(self):
+        if not self.log.exists():
+            return []
+        calls = self.log.read_text().splitlines()
+        self.log.unlink()
+        return sorted(calls)
+
+    def dry_run_note_id(self, prompt_id):
+        return self.run_cli('publish', str(prompt_id), '--dry-run').stdout.split(
+            "Note ID: ")[1].splitlines()[0]
+
+    def test_creates_then_skips_unchanged(self):
+        note_ids = list(self.note_ids.values())
+        self.assertEqual(len(set(note_ids)), 3)
+
+        self.run_cli('publish', '--min-rating', '5')
+        self.assertEqual(self.calls(), sorted(f"create {n}" for n in note_ids))
+
+        result = self.run_cli('publish', '--min-rating', '5')
+        self.assertIn("skipped 3 unchanged", result.stdout)
+        self.assertEqual(self.calls(), [])
+
+    def test_updates_after_note_edit(self):
+        self.run_cli('publish', '--min-rating', '5')
+        self.calls()
+
+        self.run_cli('note', '2', 'edited')
+        self.run_cli('publish', '--min-rating', '5')
+        self.assertEqual(self.calls(), [f"update {self.note_ids[2]}"])
+
+    def test_single_publish_uses_tracking(self):
+        self.run_cli('publish', '--min-rating', '5')
+        self.calls()
+
+        result = self.run_cli('publish', '2')
+        self.assertIn("already published unchanged", result.stdout)
+
+        self.run_cli('note', '2', 'edited')
+        self.run_cli('publish', '2')
+        self.assertEqual(self.calls(), [f"update {self.note_ids[2]}"])
+
+    def test_retries_transient_failure(self):
+        failing = self.note_ids[1]
+        self.env['MEMENTO_STUB_TRANSIENT'] = failing
+
+        result = self.run_cli('publish', '--min-rating', '5', '--retries', '1', check=False)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(self.calls().count(f"create {failing}"), 2)
+
+    def test_does_not_retry_usage_error(self):
+        failing = self.note_ids[1]
+        self.env['MEMENTO_STUB_USAGE'] = failing
+
+        result = self.run_cli('publish', '--min-rating', '5', '--retries', '2', check=False)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(self.calls().count(f"create {failing}"), 1)
+
+    def test_refuses_duplicate_note_ids(self):
+        # Prompt 1 takes prompt 2's note ID, then changes so both are pending
+        taken = self.note_ids[2]
+        self.run_cli('publish', '1', '--note-id', taken)
+        self.run_cli('note', '1', 'edited')
+        self.calls()
+
+        result = self.run_cli('publish', '--min-rating', '5', check=False)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn(f"Refusing to publish prompt #1: note ID '{taken}' is also used by prompt #2",
+                      result.stdout)
+        self.assertEqual(self.calls(), sorted([f"create {taken}", f"create {self.note_ids[3]}"]))
+
+
+if __name__ == '__main__':
+    unittest.main()